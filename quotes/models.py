@@ -1,6 +1,7 @@
-from django.db import models
-from django.db.models import QuerySet
-from typing import Optional
+from django.db import models, transaction
+from django.db.models import Q, QuerySet
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from datetime import date
 
 
@@ -21,15 +22,29 @@ class GPTPromptConfig(models.Model):
     class Meta:
         verbose_name = "GPT Prompt Configuration"
         verbose_name_plural = "GPT Prompt Configurations"
+        constraints = [
+            # Let the database enforce the single-active invariant instead
+            # of relying solely on the save() override.
+            models.UniqueConstraint(
+                fields=['is_active'],
+                condition=Q(is_active=True),
+                name='one_active_prompt',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({'active' if self.is_active else 'inactive'})"
 
     def save(self, *args, **kwargs):
-        # Ensure only one config is active at a time
+        # Ensure only one config is active at a time. Deactivating only the
+        # currently active row (rather than every other row) touches at most
+        # one record and can use the one_active_prompt partial index.
         if self.is_active:
-            GPTPromptConfig.objects.exclude(pk=self.pk).update(is_active=False)
-        super().save(*args, **kwargs) 
+            with transaction.atomic():
+                GPTPromptConfig.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
 
 class FredAero(models.Model):
@@ -46,7 +61,13 @@ class FredAero(models.Model):
         managed = False
         ordering = ['-observation_date']    # most recent dates first
         indexes = [
-            models.Index(fields=['observation_date']),
+            # Covering index so date lookups that only need the index value
+            # can be answered without touching the table rows.
+            models.Index(
+                fields=['-observation_date'],
+                include=['index_value'],
+                name='fred_aero_date_covering',
+            ),
         ]
 
     def __str__(self) -> str:
@@ -82,7 +103,7 @@ class FredAero(models.Model):
         
         return cls.objects.filter(
             observation_date__lte=first_of_month
-        ).order_by('-observation_date').first()
+        ).only('observation_date', 'index_value').order_by('-observation_date').first()
 
     @classmethod
     def get_index_range_for_analysis(
@@ -112,5 +133,43 @@ class FredAero(models.Model):
         queryset = cls.objects.filter(
             observation_date__gte=start_month,
             observation_date__lte=end_month
-        ).order_by('observation_date')        
+        ).only('observation_date', 'index_value').order_by('observation_date')
         return queryset
+
+    @classmethod
+    def get_index_values_for_analysis(
+        cls,
+        start_date: date,
+        end_date: date = None,
+    ) -> Tuple[Tuple[date, object], ...]:
+        """
+        Get (observation_date, index_value) tuples for a date range.
+
+        FRED data is monthly and effectively immutable for past months, so
+        repeated analyses of the same range are served from an in-process
+        LRU cache instead of re-querying.
+
+        Args:
+            start_date: Start of the date range
+            end_date: End of the date range (defaults to today)
+
+        Returns:
+            Tuple of (observation_date, index_value) pairs
+        """
+        end_date = end_date or date.today()
+
+        start_month = cls._get_first_of_month(start_date)
+        end_month = cls._get_first_of_month(end_date)
+
+        return _fred_index_range(start_month.isoformat(), end_month.isoformat())
+
+
+@lru_cache(maxsize=64)
+def _fred_index_range(start_month_iso: str, end_month_iso: str) -> Tuple[Tuple[date, object], ...]:
+    """Materialized FRED index rows for a month range, keyed by ISO dates."""
+    return tuple(
+        FredAero.objects.filter(
+            observation_date__gte=start_month_iso,
+            observation_date__lte=end_month_iso,
+        ).order_by('observation_date').values_list('observation_date', 'index_value')
+    )
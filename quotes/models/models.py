@@ -13,8 +13,11 @@ class Supplier(models.Model):
 class Quote(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='quotes')
     quote_number = models.CharField(max_length=100)
-    quote_date = models.DateField()
+    quote_date = models.DateField(db_index=True)
     pdf_file = models.FileField(upload_to='quotes/')
+    # GPT extraction result, kept so reports can be (re)generated on demand
+    # without re-running extraction.
+    extracted_data = models.JSONField(null=True, blank=True)
     processed_pdf = models.FileField(upload_to='processed_quotes/', null=True, blank=True)
     docx_file = models.FileField(upload_to='quotes_docx/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -29,7 +32,7 @@ class Quote(models.Model):
 
 class QuoteItem(models.Model):
     quote = models.ForeignKey(Quote, on_delete=models.CASCADE, related_name='items')
-    item_number = models.CharField(max_length=100)
+    item_number = models.CharField(max_length=100, db_index=True)
     description = models.TextField()
     quantity = models.DecimalField(max_digits=10, decimal_places=2)
     unit_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -48,11 +51,16 @@ class PriceHistory(models.Model):
     quote_item = models.ForeignKey(QuoteItem, on_delete=models.CASCADE, related_name='price_history')
     business_unit = models.CharField(max_length=50)  # A, B, or C
     historical_price = models.DecimalField(max_digits=10, decimal_places=2)
-    purchase_date = models.DateField()
+    purchase_date = models.DateField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name_plural = 'Price histories'
+        indexes = [
+            # Matches the analyzer's lookup shape: equality on the item,
+            # range scan on the date (most recent first).
+            models.Index(fields=['quote_item', '-purchase_date'], name='ph_item_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.quote_item.item_number} - {self.business_unit} - {self.purchase_date}"
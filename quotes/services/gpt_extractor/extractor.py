@@ -8,6 +8,31 @@ from datetime import datetime
 from quotes.models import GPTPromptConfig
 
 
+# Default prompts used when no active GPTPromptConfig exists, kept at
+# module level so they are allocated once.
+_DEFAULT_SYSTEM_PROMPT = """You are a precise quote data extractor. Your task is to extract structured data from supplier quotes.
+Important guidelines:
+1. Extract ONLY factual information present in the text
+2. For dates, ensure they are in YYYY-MM-DD format
+3. For numbers, ensure they are converted to proper numerical values
+4. For item numbers, preserve exact formatting
+5. If a value is clearly missing, use null
+6. For unit prices, extract the individual unit price, not total price
+7. If unit of measure is not specified, use 'EA' for each
+
+The output should match this format exactly:
+{format_instructions}
+"""
+
+_DEFAULT_USER_PROMPT = "Please extract the quote information from the following text:\n\n{text_content}"
+
+# The default template never changes, so compile it once at import.
+_DEFAULT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", _DEFAULT_SYSTEM_PROMPT),
+    ("user", _DEFAULT_USER_PROMPT)
+])
+
+
 class QuoteItem(BaseModel):
     """Model for individual items in a quote."""
     item_number: Optional[str] = Field(None, description="Item/part number")
@@ -35,46 +60,47 @@ class GPTExtractor:
             temperature=0,  # We want consistent results
         )
         self.parser = PydanticOutputParser(pydantic_object=QuoteData)
+        # Format instructions are deterministic per parser, and the prompt
+        # template only changes when the active config is edited in admin,
+        # so both are cached rather than rebuilt on every extraction.
+        self._format_instructions = self.parser.get_format_instructions()
+        self._prompt_template: Optional[ChatPromptTemplate] = None
+        self._prompt_config_stamp: Optional[datetime] = None
 
-    def _get_active_prompt_config(self) -> tuple[str, str]:
+    def _get_active_prompt_config(self) -> tuple[str, str, Optional[datetime]]:
         """Get the active prompt configuration from the database."""
-        try:
-            config = GPTPromptConfig.objects.get(is_active=True)
-            return config.system_prompt, config.user_prompt
-        except GPTPromptConfig.DoesNotExist:
-            # Return default prompts if no active config exists
-            return (
-                """You are a precise quote data extractor. Your task is to extract structured data from supplier quotes.
-                Important guidelines:
-                1. Extract ONLY factual information present in the text
-                2. For dates, ensure they are in YYYY-MM-DD format
-                3. For numbers, ensure they are converted to proper numerical values
-                4. For item numbers, preserve exact formatting
-                5. If a value is clearly missing, use null
-                6. For unit prices, extract the individual unit price, not total price
-                7. If unit of measure is not specified, use 'EA' for each
-
-                The output should match this format exactly:
-                {format_instructions}
-                """,
-                "Please extract the quote information from the following text:\n\n{text_content}"
-            )
+        config = GPTPromptConfig.objects.filter(is_active=True).values(
+            'system_prompt', 'user_prompt', 'updated_at'
+        ).first()
+        if config is not None:
+            return config['system_prompt'], config['user_prompt'], config['updated_at']
+
+        # Fall back to the default prompts if no active config exists
+        return _DEFAULT_SYSTEM_PROMPT, _DEFAULT_USER_PROMPT, None
 
     def _create_extraction_prompt(self) -> ChatPromptTemplate:
-        """Create the prompt template for quote extraction."""
-        system_prompt, user_prompt = self._get_active_prompt_config()
-        return ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("user", user_prompt)
-        ])
+        """Create the prompt template for quote extraction.
+
+        The built template is cached on the instance and only rebuilt when
+        the active config's updated_at stamp changes.
+        """
+        system_prompt, user_prompt, stamp = self._get_active_prompt_config()
+        if stamp is None:
+            return _DEFAULT_PROMPT_TEMPLATE
+        if self._prompt_template is None or stamp != self._prompt_config_stamp:
+            self._prompt_template = ChatPromptTemplate.from_messages([
+                ("system", system_prompt),
+                ("user", user_prompt)
+            ])
+            self._prompt_config_stamp = stamp
+        return self._prompt_template
 
     def _preprocess_text(self, text: str) -> str:
         """Clean and prepare text for processing."""
-        # Remove multiple spaces and normalize newlines
-        text = ' '.join(text.split())
-        # Remove any unusual characters that might interfere with processing
-        text = ''.join(char for char in text if ord(char) < 128)
-        return text
+        # Remove multiple spaces and normalize newlines, then strip any
+        # non-ASCII characters that might interfere with processing. The
+        # codec runs in C, unlike a per-character Python loop.
+        return ' '.join(text.split()).encode('ascii', 'ignore').decode('ascii')
 
     def _validate_date(self, date_str: Optional[str]) -> Optional[str]:
         """Validate and format the date string."""
@@ -119,7 +145,7 @@ class GPTExtractor:
             # Create and format the prompt
             prompt = self._create_extraction_prompt()
             formatted_prompt = prompt.format_messages(
-                format_instructions=self.parser.get_format_instructions(),
+                format_instructions=self._format_instructions,
                 text_content=cleaned_text
             )
 
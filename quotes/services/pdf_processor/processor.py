@@ -1,40 +1,72 @@
 import pymupdf
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 class PDFProcessor:
+    """Extracts text, tables and metadata from a PDF file.
+
+    Can be used as a context manager to share a single open document
+    across multiple extractions:
+
+        with PDFProcessor(path) as processor:
+            text = processor.extract_text()
+            metadata = processor.get_metadata()
+
+    Outside a ``with`` block each method opens and closes the file
+    itself, preserving the original single-shot behaviour.
+    """
+
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
         self.text_content = None
+        self._doc: Optional[pymupdf.Document] = None
+
+    def __enter__(self) -> 'PDFProcessor':
+        self._doc = pymupdf.open(self.pdf_path)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
 
     def extract_text(self) -> str:
         """Extract text content from the PDF file."""
-        doc = pymupdf.open(self.pdf_path)
-        text = ""
-        
-        for page in doc:
-            text += page.get_text()
-        
-        doc.close()
+        # Join once instead of concatenating per page, which would copy the
+        # accumulated text on every iteration.
+        if self._doc is not None:
+            text = ''.join(page.get_text('text', sort=False) for page in self._doc)
+        else:
+            with pymupdf.open(self.pdf_path) as doc:
+                text = ''.join(page.get_text('text', sort=False) for page in doc)
+
         self.text_content = text
         return text
 
     def extract_tables(self) -> List[Dict]:
         """Extract tables from the PDF file."""
-        doc = pymupdf.open(self.pdf_path)
         tables = []
-        
-        for page in doc:
-            # Extract tables using PyMuPDF's table detection
-            # This is a placeholder - actual implementation will depend on PDF structure
-            pass
-        
-        doc.close()
+
+        if self._doc is not None:
+            doc = self._doc
+        else:
+            doc = pymupdf.open(self.pdf_path)
+
+        try:
+            for page in doc:
+                # Extract tables using PyMuPDF's table detection
+                # This is a placeholder - actual implementation will depend on PDF structure
+                pass
+        finally:
+            if doc is not self._doc:
+                doc.close()
+
         return tables
 
     def get_metadata(self) -> Dict:
         """Extract metadata from the PDF file."""
-        doc = pymupdf.open(self.pdf_path)
-        metadata = doc.metadata
-        doc.close()
-        return metadata 
\ No newline at end of file
+        if self._doc is not None:
+            return self._doc.metadata
+
+        with pymupdf.open(self.pdf_path) as doc:
+            return doc.metadata
@@ -0,0 +1,42 @@
+"""Numeric kernels for price statistics.
+
+The reductions here operate purely on NumPy arrays so the hot numeric
+path never touches pandas indexing or per-row Python arithmetic.
+"""
+from typing import Dict
+
+import numpy as np
+
+
+def compute_stats(prices: np.ndarray, dates: np.ndarray,
+                  cutoff_90: np.datetime64, cutoff_180: np.datetime64) -> Dict:
+    """Compute summary statistics over raw price history arrays.
+
+    Args:
+        prices: float64 array of historical prices
+        dates: datetime64 array of purchase dates, aligned with prices
+        cutoff_90: boundary of the recent 90-day window
+        cutoff_180: boundary of the previous 90-day window
+
+    Returns:
+        Dict with min_price, max_price, avg_price, price_volatility and
+        recent_trend (None when either trend window is empty).
+    """
+    stats = {
+        'min_price': float(prices.min()),
+        'max_price': float(prices.max()),
+        'avg_price': float(prices.mean()),
+        'price_volatility': float(prices.std(ddof=1)) if prices.size > 1 else None,
+    }
+
+    recent_mask = dates >= cutoff_90
+    previous_mask = (dates < cutoff_90) & (dates >= cutoff_180)
+
+    if recent_mask.any() and previous_mask.any():
+        recent_avg = prices[recent_mask].mean()
+        previous_avg = prices[previous_mask].mean()
+        stats['recent_trend'] = float((recent_avg - previous_avg) / previous_avg * 100)
+    else:
+        stats['recent_trend'] = None
+
+    return stats
@@ -1,56 +1,339 @@
-from typing import Dict, List
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import matplotlib
+# Select the headless backend before seaborn imports pyplot, which would
+# otherwise resolve (and possibly initialize) a GUI backend first.
+matplotlib.use('Agg')
 import seaborn as sns
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from django.db import connections
 from datetime import datetime, timedelta, date
 from quotes.models import FredAero
+from ._kernels import compute_stats
+
+# Styling is a global side effect; apply it once at import instead of on
+# every plot call.
+sns.set_style("whitegrid")
 
 
 class PriceAnalyzer:
+    # Screen-quality output; 300 DPI rasterizes ~9x more pixels than needed
+    # for plots viewed in reports.
+    plot_dpi = 100
+
     def __init__(self):
         self.business_units = ['business_unit_a', 'business_unit_b', 'business_unit_c']
+        # One figure reused for every plot; allocated lazily on first use
+        # and cleared between calls instead of rebuilt. Rendering is not
+        # thread-safe, so access is serialized through a lock in case
+        # reports are generated from worker threads.
+        self._fig = None
+        self._ax = None
+        self._plot_lock = threading.Lock()
+
+    def _get_axis(self, figsize: tuple):
+        """Return the shared axes, creating the figure on first use.
+
+        Uses the OO Figure/FigureCanvasAgg API rather than pyplot, so no
+        figure is ever registered with pyplot's global manager.
+        """
+        if self._fig is None:
+            self._fig = Figure(figsize=figsize)
+            FigureCanvasAgg(self._fig)
+            self._ax = self._fig.add_subplot(111)
+        else:
+            self._ax.clear()
+            self._fig.set_size_inches(*figsize)
+        return self._ax
         
+    def _fetch_one(self, unit: str, item_number: str, cutoff_date: datetime) -> List[Tuple]:
+        """Fetch raw (price, purchase_date) rows for a single business unit."""
+        # Django connections are thread-local and the executor's threads are
+        # short-lived, so close explicitly; otherwise each worker abandons a
+        # fresh server connection to GC when it exits.
+        try:
+            with connections[unit].cursor() as cursor:
+                # This is a placeholder query - adjust according to actual database schema
+                query = """
+                    SELECT
+                        price,
+                        purchase_date
+                    FROM historical_purchases
+                    WHERE item_number = %s
+                    AND purchase_date >= %s
+                    ORDER BY purchase_date DESC
+                """
+                cursor.execute(query, [item_number, cutoff_date])
+                return cursor.fetchall()
+        finally:
+            connections[unit].close()
+
     def fetch_historical_prices(self, item_number: str, lookback_days: int = 365) -> pd.DataFrame:
         """
         Fetch historical prices for an item from all business units.
         Returns a DataFrame with columns: business_unit, price, purchase_date
         """
         cutoff_date = datetime.now() - timedelta(days=lookback_days)
-        all_data = []
 
+        # Each business unit has its own connection, so the three round-trips
+        # can overlap instead of running back-to-back.
+        with ThreadPoolExecutor(max_workers=len(self.business_units)) as executor:
+            futures = {
+                unit: executor.submit(self._fetch_one, unit, item_number, cutoff_date)
+                for unit in self.business_units
+            }
+            results = {unit: future.result() for unit, future in futures.items()}
+
+        # Accumulate plain columns and build the frame once with explicit
+        # dtypes, rather than one object-dtype frame per unit plus a concat.
+        prices: List[float] = []
+        dates: List = []
+        row_counts = []
         for unit in self.business_units:
+            rows = results[unit]
+            row_counts.append(len(rows))
+            for price, purchase_date in rows:
+                prices.append(price)
+                dates.append(purchase_date)
+
+        return pd.DataFrame({
+            'price': np.asarray(prices, dtype=np.float64),
+            'purchase_date': pd.to_datetime(dates),
+            'business_unit': pd.Categorical(
+                np.repeat(self.business_units, row_counts),
+                categories=self.business_units
+            ),
+        })
+
+    def _fetch_many(self, unit: str, item_numbers: List[str], cutoff_date: datetime) -> List[Tuple]:
+        """Fetch (item_number, price, purchase_date) rows for a batch of items."""
+        placeholders = ', '.join(['%s'] * len(item_numbers))
+        try:
             with connections[unit].cursor() as cursor:
-                # This is a placeholder query - adjust according to actual database schema
-                query = """
-                    SELECT 
+                query = f"""
+                    SELECT
+                        item_number,
                         price,
                         purchase_date
                     FROM historical_purchases
+                    WHERE item_number IN ({placeholders})
+                    AND purchase_date >= %s
+                    ORDER BY item_number, purchase_date DESC
+                """
+                cursor.execute(query, [*item_numbers, cutoff_date])
+                return cursor.fetchall()
+        finally:
+            connections[unit].close()
+
+    def analyze_items_prices(self, item_numbers: List[str], lookback_days: int = 365) -> Dict[str, Dict]:
+        """
+        Analyze a batch of items with one history query per business unit
+        instead of one per item, dispatching per-item statistics and
+        plotting over the already-fetched rows.
+
+        Returns a dict mapping item_number to the same analysis shape as
+        analyze_item_prices. Shares the process-wide analysis cache with
+        the single-item path: cached items are served directly and only
+        the rest are fetched; callers must treat the dicts as read-only.
+        """
+        item_numbers = list(dict.fromkeys(item_numbers))  # de-dupe, keep order
+        if not item_numbers:
+            return {}
+
+        bucket = int(time.time()) // 3600
+        analyses: Dict[str, Dict] = {}
+        missing: List[str] = []
+        for item_number in item_numbers:
+            cached = _analysis_cache_get((item_number, lookback_days, bucket))
+            if cached is not None:
+                analyses[item_number] = cached
+            else:
+                missing.append(item_number)
+        if not missing:
+            return analyses
+
+        cutoff_date = datetime.now() - timedelta(days=lookback_days)
+
+        with ThreadPoolExecutor(max_workers=len(self.business_units)) as executor:
+            futures = {
+                unit: executor.submit(self._fetch_many, unit, missing, cutoff_date)
+                for unit in self.business_units
+            }
+            results = {unit: future.result() for unit, future in futures.items()}
+
+        item_col: List[str] = []
+        prices: List[float] = []
+        dates: List = []
+        row_counts = []
+        for unit in self.business_units:
+            rows = results[unit]
+            row_counts.append(len(rows))
+            for item_number, price, purchase_date in rows:
+                item_col.append(item_number)
+                prices.append(price)
+                dates.append(purchase_date)
+
+        data = pd.DataFrame({
+            'item_number': item_col,
+            'price': np.asarray(prices, dtype=np.float64),
+            'purchase_date': pd.to_datetime(dates),
+            'business_unit': pd.Categorical(
+                np.repeat(self.business_units, row_counts),
+                categories=self.business_units
+            ),
+        })
+
+        grouped = {item: sub for item, sub in data.groupby('item_number', sort=False)}
+
+        for item_number in missing:
+            item_data = grouped.get(item_number)
+            if item_data is None:
+                analysis = {
+                    'statistics': self.calculate_price_statistics(pd.DataFrame()),
+                    'plot_path': None,
+                    'plot_points': None,
+                    'has_data': False
+                }
+            else:
+                analysis = {
+                    'statistics': self.calculate_price_statistics(item_data),
+                    'plot_path': self.generate_price_trend_plot(item_data, item_number),
+                    'plot_points': self._plot_points(item_data),
+                    'has_data': True
+                }
+            analyses[item_number] = analysis
+            _analysis_cache_put((item_number, lookback_days, bucket), analysis)
+        return analyses
+
+    def _fetch_stats_one(self, unit: str, item_number: str, cutoff_date: datetime,
+                         cutoff_90: datetime, cutoff_180: datetime) -> Tuple:
+        """Fetch aggregate price statistics for a single business unit."""
+        try:
+            with connections[unit].cursor() as cursor:
+                query = """
+                    SELECT
+                        COUNT(price),
+                        MIN(price),
+                        MAX(price),
+                        SUM(price),
+                        SUM(price * price),
+                        COUNT(CASE WHEN purchase_date >= %s THEN 1 END),
+                        SUM(CASE WHEN purchase_date >= %s THEN price END),
+                        COUNT(CASE WHEN purchase_date >= %s AND purchase_date < %s THEN 1 END),
+                        SUM(CASE WHEN purchase_date >= %s AND purchase_date < %s THEN price END)
+                    FROM historical_purchases
                     WHERE item_number = %s
                     AND purchase_date >= %s
-                    ORDER BY purchase_date DESC
                 """
-                cursor.execute(query, [item_number, cutoff_date])
-                rows = cursor.fetchall()
-                
-                unit_data = pd.DataFrame(rows, columns=['price', 'purchase_date'])
-                unit_data['business_unit'] = unit
-                all_data.append(unit_data)
+                cursor.execute(query, [
+                    cutoff_90, cutoff_90,
+                    cutoff_180, cutoff_90, cutoff_180, cutoff_90,
+                    item_number, cutoff_date
+                ])
+                return cursor.fetchone()
+        finally:
+            connections[unit].close()
+
+    def fetch_price_statistics(self, item_number: str, lookback_days: int = 365) -> Dict:
+        """
+        Compute price statistics in SQL instead of transferring the full
+        history to Python. Each business unit answers one aggregate query
+        returning a handful of scalars; the per-unit sums are combined
+        exactly here.
+        """
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=lookback_days)
+        cutoff_90 = now - timedelta(days=90)
+        cutoff_180 = now - timedelta(days=180)
+
+        with ThreadPoolExecutor(max_workers=len(self.business_units)) as executor:
+            futures = [
+                executor.submit(self._fetch_stats_one, unit, item_number,
+                                cutoff_date, cutoff_90, cutoff_180)
+                for unit in self.business_units
+            ]
+            rows = [future.result() for future in futures]
+
+        count = sum(row[0] or 0 for row in rows)
+        if count == 0:
+            return {
+                'min_price': None,
+                'max_price': None,
+                'avg_price': None,
+                'price_volatility': None,
+                'recent_trend': None
+            }
+
+        total_sum = sum(float(row[3] or 0) for row in rows)
+        total_sq_sum = sum(float(row[4] or 0) for row in rows)
+        avg_price = total_sum / count
 
-        if not all_data:
-            return pd.DataFrame(columns=['business_unit', 'price', 'purchase_date'])
-            
-        return pd.concat(all_data, ignore_index=True)
+        # Sample variance from the combined sums (ddof=1, matching pandas).
+        if count > 1:
+            variance = max((total_sq_sum - count * avg_price ** 2) / (count - 1), 0.0)
+            volatility = math.sqrt(variance)
+        else:
+            volatility = None
+
+        stats = {
+            'min_price': min(float(row[1]) for row in rows if row[1] is not None),
+            'max_price': max(float(row[2]) for row in rows if row[2] is not None),
+            'avg_price': avg_price,
+            'price_volatility': volatility,
+        }
+
+        # Recent trend (last 90 days vs previous 90 days)
+        recent_count = sum(row[5] or 0 for row in rows)
+        recent_sum = sum(float(row[6] or 0) for row in rows)
+        previous_count = sum(row[7] or 0 for row in rows)
+        previous_sum = sum(float(row[8] or 0) for row in rows)
+
+        if recent_count and previous_count:
+            recent_avg = recent_sum / recent_count
+            previous_avg = previous_sum / previous_count
+            stats['recent_trend'] = (recent_avg - previous_avg) / previous_avg * 100
+        else:
+            stats['recent_trend'] = None
+
+        return stats
+
+    def _plot_points(self, data: pd.DataFrame) -> Optional[List[Tuple[float, float]]]:
+        """Price series scaled into a unit box for native vector rendering.
+
+        x runs from oldest (0) to newest (1) purchase, y from lowest (0) to
+        highest (1) price. Returns None when fewer than two points exist,
+        signalling callers to fall back to the rasterized plot.
+        """
+        if len(data) < 2:
+            return None
+
+        ordered = data.sort_values('purchase_date')
+        x = ordered['purchase_date'].to_numpy().astype('datetime64[s]').astype(np.float64)
+        y = ordered['price'].to_numpy(dtype=np.float64)
+
+        x_span = x[-1] - x[0]
+        y_min = y.min()
+        y_span = y.max() - y_min
+        xs = (x - x[0]) / x_span if x_span else np.zeros_like(x)
+        ys = (y - y_min) / y_span if y_span else np.full_like(y, 0.5)
+        return list(zip(xs.tolist(), ys.tolist()))
 
     def _normalize_series(self, data: pd.Series) -> pd.Series:
         """Normalize a series to percentage change from first value."""
         if data.empty:
-            return pd.Series()
-        first_value = data.iloc[0]
+            return pd.Series(dtype=np.float64)
+        values = data.to_numpy(dtype=np.float64)
+        first_value = values[0]
         if first_value == 0:
-            return pd.Series([0] * len(data))
-        return ((data - first_value) / first_value) * 100
+            return pd.Series(np.zeros(len(values)), index=data.index)
+        return pd.Series((values - first_value) / first_value * 100.0, index=data.index)
 
     def _add_change_annotation(self, ax, data: pd.Series, y_offset: float = 5):
         """Add total change annotation to the plot."""
@@ -82,101 +365,117 @@ class PriceAnalyzer:
         start_date = data['purchase_date'].min()
         end_date = data['purchase_date'].max()
 
-        # Get index data for the same period
-        index_data = FredAero.get_index_range_for_analysis(
+        # Work out up front which units have enough points for a trend, so
+        # degenerate items skip figure setup entirely.
+        unit_sizes = data.groupby('business_unit', observed=True, sort=False).size()
+        valid_units = [unit for unit, size in unit_sizes.items() if size >= 2]
+        if not valid_units:
+            return None
+
+        # Get index data for the same period; the cached classmethod returns
+        # plain (date, value) tuples so repeated ranges skip the DB entirely.
+        index_rows = FredAero.get_index_values_for_analysis(
             start_date=start_date.date() if isinstance(start_date, datetime) else start_date,
             end_date=end_date.date() if isinstance(end_date, datetime) else end_date
         )
-        if not index_data.exists():
+        if not index_rows:
             return self._generate_basic_price_plot(data, item_number)
 
-        # Convert index data to DataFrame
-        index_df = pd.DataFrame(
-            index_data.values('observation_date', 'index_value')
-        ).rename(columns={
-            'observation_date': 'date',
-            'index_value': 'series_index'  # Match the db_column name
-        })
+        # 'series_index' matches the db_column name
+        index_df = pd.DataFrame.from_records(list(index_rows), columns=['date', 'series_index'])
 
-        if index_df.empty:
-            return self._generate_basic_price_plot(data, item_number)
+        # Normalize every unit in one vectorized pass. The rows arrive from
+        # SQL newest-first, but data was re-sorted ascending by
+        # purchase_date above, so transform('first') is each unit's
+        # earliest price in the window.
+        first_prices = data.groupby('business_unit', observed=True)['price'].transform('first')
+        data['pct_change'] = np.where(
+            first_prices != 0,
+            (data['price'] - first_prices) / first_prices * 100.0,
+            0.0
+        )
 
-        # Create the plot
-        sns.set_style("whitegrid")
-        fig, ax1 = plt.subplots(figsize=(12, 6))
-
-        # Plot normalized price changes as scatter points
-        for unit in data['business_unit'].unique():
-            unit_data = data[data['business_unit'] == unit]
-            if not unit_data.empty:
-                normalized_prices = self._normalize_series(unit_data['price'])
-                if not normalized_prices.empty:
-                    ax1.scatter(
-                        unit_data['purchase_date'],
-                        normalized_prices,
-                        label=f'{unit} (Price)',
-                        alpha=0.6,
-                        s=50
-                    )
-                    # Add change annotation for each business unit
-                    self._add_change_annotation(ax1, normalized_prices, y_offset=5 * (list(data['business_unit'].unique()).index(unit) + 1))
-
-        # Plot normalized index as a line
-        normalized_index = self._normalize_series(index_df['series_index'])
-        if not normalized_index.empty:
-            ax1.plot(
-                index_df['date'],
-                normalized_index,
-                color='red',
-                label='Aerospace Index',
-                alpha=0.8,
-                linewidth=2
-            )
-            # Add change annotation for index
-            self._add_change_annotation(ax1, normalized_index, y_offset=-15)
+        # Annotation offsets per unit, computed once rather than via a
+        # list .index() lookup on every iteration.
+        unit_offsets = {unit: 5 * (idx + 1) for idx, unit in enumerate(valid_units)}
 
-        # Customize the plot
-        ax1.set_xlabel('Date')
-        ax1.set_ylabel('Percentage Change from Initial Value (%)')
-        plt.title(f'Normalized Price Trends vs Aerospace Index - Item {item_number}')
-        
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
-        
-        # Add legend with a better position that doesn't overlap the plot
-        plt.legend(loc='center left', bbox_to_anchor=(1.05, 0.5))
-        
-        # Save plot to a temporary file
-        plot_path = f'media/plots/price_trend_{item_number}.png'
-        plt.savefig(plot_path, bbox_inches='tight', dpi=300)  # Higher DPI for better quality
-        plt.close(fig)  # Be specific about which figure to close
+        with self._plot_lock:
+            # Create the plot on the shared figure
+            ax1 = self._get_axis((12, 6))
+
+            # Plot normalized price changes as scatter points
+            for unit, unit_data in data.groupby('business_unit', observed=True, sort=False):
+                if unit not in unit_offsets:
+                    continue
+                ax1.scatter(
+                    unit_data['purchase_date'],
+                    unit_data['pct_change'],
+                    label=f'{unit} (Price)',
+                    alpha=0.6,
+                    s=50
+                )
+                # Add change annotation for each business unit
+                self._add_change_annotation(ax1, unit_data['pct_change'], y_offset=unit_offsets[unit])
+
+            # Plot normalized index as a line
+            normalized_index = self._normalize_series(index_df['series_index'])
+            if not normalized_index.empty:
+                ax1.plot(
+                    index_df['date'],
+                    normalized_index,
+                    color='red',
+                    label='Aerospace Index',
+                    alpha=0.8,
+                    linewidth=2
+                )
+                # Add change annotation for index
+                self._add_change_annotation(ax1, normalized_index, y_offset=-15)
+
+            # Customize the plot
+            ax1.set_xlabel('Date')
+            ax1.set_ylabel('Percentage Change from Initial Value (%)')
+            ax1.set_title(f'Normalized Price Trends vs Aerospace Index - Item {item_number}')
+
+            # Rotate x-axis labels for better readability
+            ax1.tick_params(axis='x', rotation=45)
+
+            # Keep the legend inside the axes: tight_layout reserves no room
+            # for artists anchored outside them, so an external legend would
+            # be clipped from the saved image. 'best' dodges the data.
+            ax1.legend(loc='best')
+
+            # Save plot to a temporary file; tight_layout renders once, unlike
+            # bbox_inches='tight' which triggers a second full render.
+            plot_path = f'media/plots/price_trend_{item_number}.png'
+            self._fig.tight_layout()
+            self._fig.savefig(plot_path, dpi=self.plot_dpi)
 
         return plot_path
 
     def _generate_basic_price_plot(self, data: pd.DataFrame, item_number: str) -> str:
         """Generate a basic price plot when index data is not available."""
-        sns.set_style("whitegrid")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        sns.scatterplot(
-            data=data,
-            x='purchase_date',
-            y='price',
-            hue='business_unit',
-            alpha=0.6,
-            s=50,
-            ax=ax
-        )
+        with self._plot_lock:
+            ax = self._get_axis((10, 6))
 
-        plt.title(f'Historical Price Trends - Item {item_number}')
-        ax.set_xlabel('Purchase Date')
-        ax.set_ylabel('Price')
-        plt.xticks(rotation=45)
-        
-        # Save plot to a temporary file
-        plot_path = f'media/plots/price_trend_{item_number}.png'
-        plt.savefig(plot_path, bbox_inches='tight', dpi=300)  # Higher DPI for better quality
-        plt.close(fig)  # Be specific about which figure to close
+            sns.scatterplot(
+                data=data,
+                x='purchase_date',
+                y='price',
+                hue='business_unit',
+                alpha=0.6,
+                s=50,
+                ax=ax
+            )
+
+            ax.set_title(f'Historical Price Trends - Item {item_number}')
+            ax.set_xlabel('Purchase Date')
+            ax.set_ylabel('Price')
+            ax.tick_params(axis='x', rotation=45)
+
+            # Save plot to a temporary file
+            plot_path = f'media/plots/price_trend_{item_number}.png'
+            self._fig.tight_layout()
+            self._fig.savefig(plot_path, dpi=self.plot_dpi)
 
         return plot_path
 
@@ -191,47 +490,80 @@ class PriceAnalyzer:
                 'recent_trend': None
             }
 
-        stats = {
-            'min_price': float(data['price'].min()),
-            'max_price': float(data['price'].max()),
-            'avg_price': float(data['price'].mean()),
-            'price_volatility': float(data['price'].std()),
-        }
-
-        # Calculate recent trend (last 90 days vs previous 90 days)
-        recent_data = data[data['purchase_date'] >= datetime.now() - timedelta(days=90)]
-        previous_data = data[
-            (data['purchase_date'] < datetime.now() - timedelta(days=90)) &
-            (data['purchase_date'] >= datetime.now() - timedelta(days=180))
-        ]
-
-        if not recent_data.empty and not previous_data.empty:
-            recent_avg = recent_data['price'].mean()
-            previous_avg = previous_data['price'].mean()
-            stats['recent_trend'] = float((recent_avg - previous_avg) / previous_avg * 100)
-        else:
-            stats['recent_trend'] = None
-
-        return stats
+        # The numeric core runs over raw NumPy arrays in the kernel module,
+        # with 'now' and the trend-window boundaries computed once.
+        now = pd.Timestamp.now()
+        return compute_stats(
+            data['price'].to_numpy(dtype=np.float64),
+            data['purchase_date'].to_numpy(),
+            np.datetime64(now - pd.Timedelta(days=90)),
+            np.datetime64(now - pd.Timedelta(days=180)),
+        )
 
     def analyze_item_prices(self, item_number: str, lookback_days: int = 365) -> Dict:
         """
         Perform complete price analysis for an item.
         Returns both statistical data and plot path.
+
+        Results are served from a process-wide LRU cache for up to an
+        hour; the same item numbers recur across uploads from a supplier's
+        catalog, and historical prices barely move within that window.
+        Callers must treat the returned dict as read-only.
         """
-        historical_data = self.fetch_historical_prices(item_number, lookback_days)
-        
-        if historical_data.empty:
+        key = (item_number, lookback_days, int(time.time()) // 3600)
+        analysis = _analysis_cache_get(key)
+        if analysis is None:
+            analysis = self._analyze_item_prices_uncached(item_number, lookback_days)
+            _analysis_cache_put(key, analysis)
+        return analysis
+
+    def _analyze_item_prices_uncached(self, item_number: str, lookback_days: int) -> Dict:
+        """Run the full analysis: aggregate stats, then rows and plot."""
+        statistics = self.fetch_price_statistics(item_number, lookback_days)
+
+        if statistics['min_price'] is None:
             return {
-                'statistics': self.calculate_price_statistics(historical_data),
+                'statistics': statistics,
                 'plot_path': None,
+                'plot_points': None,
                 'has_data': False
             }
 
+        # Only the plot needs row-level data; items without history never
+        # pay for the full transfer.
+        historical_data = self.fetch_historical_prices(item_number, lookback_days)
         plot_path = self.generate_price_trend_plot(historical_data, item_number)
-        
+
         return {
-            'statistics': self.calculate_price_statistics(historical_data),
+            'statistics': statistics,
             'plot_path': plot_path,
+            'plot_points': self._plot_points(historical_data),
             'has_data': True
-        } 
\ No newline at end of file
+        }
+
+
+# Process-wide analysis cache shared by the single-item and batch paths.
+# Keys are (item_number, lookback_days, hourly bucket): the bucket rolls
+# entries over every hour, bounding staleness, and the size bound keeps
+# memory flat under a wide SKU catalog.
+_ANALYSIS_CACHE_MAXSIZE = 1024
+_analysis_cache: 'OrderedDict[Tuple[str, int, int], Dict]' = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def _analysis_cache_get(key: Tuple[str, int, int]) -> Dict:
+    """Return the cached analysis for key (refreshing its LRU slot), or None."""
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+        return analysis
+
+
+def _analysis_cache_put(key: Tuple[str, int, int], analysis: Dict) -> None:
+    """Store an analysis, evicting least-recently-used entries past the bound."""
+    with _analysis_cache_lock:
+        _analysis_cache[key] = analysis
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > _ANALYSIS_CACHE_MAXSIZE:
+            _analysis_cache.popitem(last=False)
@@ -1,16 +1,23 @@
 from django.shortcuts import render
 import os
+import shutil
+from pathlib import Path
 from django.shortcuts import render, redirect
 from django.http import FileResponse, Http404
 from django.views import View
 from django.contrib import messages
 from django.conf import settings
+from django.db import transaction
 
 from .models import Quote, Supplier
 from .services.pdf_processor.processor import PDFProcessor
 from .services.gpt_extractor.extractor import GPTExtractor
 from .services.report_generator.generator import ReportGenerator
 
+# Resolved and created once at import instead of per upload request.
+_UPLOAD_DIR = Path(settings.MEDIA_ROOT) / 'uploads'
+_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
 
 class QuoteUploadView(View):
     template_name = 'quotes/upload.html'
@@ -30,40 +37,34 @@ class QuoteUploadView(View):
 
         try:
             # Save the uploaded file
-            upload_path = os.path.join(settings.MEDIA_ROOT, 'uploads', quote_file.name)
-            os.makedirs(os.path.dirname(upload_path), exist_ok=True)
-            
-            with open(upload_path, 'wb+') as destination:
-                for chunk in quote_file.chunks():
-                    destination.write(chunk)
+            upload_path = _UPLOAD_DIR / quote_file.name
+
+            # Stream with 1 MiB buffers; Django's default 64 KB chunks cost
+            # noticeably more syscalls per megabyte.
+            with open(upload_path, 'wb', buffering=1 << 20) as destination:
+                shutil.copyfileobj(quote_file, destination, length=1 << 20)
 
-            # Process the PDF
-            pdf_processor = PDFProcessor(upload_path)
-            text_content = pdf_processor.extract_text()
+            # Process the PDF on a single shared document handle
+            with PDFProcessor(upload_path) as pdf_processor:
+                text_content = pdf_processor.extract_text()
 
             # Extract structured data using GPT
             gpt_extractor = GPTExtractor()
             quote_data = gpt_extractor.extract_quote_data(text_content)
 
-            # Save to database
-            supplier, _ = Supplier.objects.get_or_create(name=quote_data.supplier_name)
-            
-            quote = Quote.objects.create(
-                supplier=supplier,
-                quote_number=quote_data.quote_number,
-                quote_date=quote_data.quote_date,
-                pdf_file=upload_path
-            )
+            # Save to database. Report generation is deferred to the first
+            # download of each format, so the upload path only pays for
+            # extraction; the extracted data is stored for the generators.
+            with transaction.atomic():
+                supplier, _ = Supplier.objects.get_or_create(name=quote_data.supplier_name)
 
-            # Generate reports
-            report_generator = ReportGenerator(quote_data.dict())
-            pdf_path = report_generator.generate_pdf()
-            docx_path = report_generator.generate_docx()
-
-            # Update quote with generated files
-            quote.processed_pdf = pdf_path
-            quote.docx_file = docx_path
-            quote.save()
+                quote = Quote.objects.create(
+                    supplier=supplier,
+                    quote_number=quote_data.quote_number,
+                    quote_date=quote_data.quote_date,
+                    pdf_file=str(upload_path),
+                    extracted_data=quote_data.dict()
+                )
 
             # Store quote ID in session for retrieval
             request.session['last_quote_id'] = quote.id
@@ -85,7 +86,7 @@ class QuoteResultView(View):
             return redirect('quote_upload')
 
         try:
-            quote = Quote.objects.get(id=quote_id)
+            quote = Quote.objects.select_related('supplier').get(id=quote_id)
             return render(request, self.template_name, {'quote': quote})
         except Quote.DoesNotExist:
             messages.error(request, 'Quote not found.')
@@ -95,20 +96,32 @@ class QuoteResultView(View):
 class DownloadReportView(View):
     def get(self, request, quote_id, format='pdf'):
         try:
-            quote = Quote.objects.get(id=quote_id)
-            
+            quote = Quote.objects.select_related('supplier').get(id=quote_id)
+
             if format == 'pdf':
+                if not quote.processed_pdf:
+                    quote.processed_pdf = ReportGenerator(quote.extracted_data).generate_pdf()
+                    quote.save(update_fields=['processed_pdf'])
                 file_path = quote.processed_pdf.path
                 content_type = 'application/pdf'
             elif format == 'docx':
+                if not quote.docx_file:
+                    quote.docx_file = ReportGenerator(quote.extracted_data).generate_docx()
+                    quote.save(update_fields=['docx_file'])
                 file_path = quote.docx_file.path
                 content_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
             else:
                 raise Http404('Invalid format requested')
 
-            response = FileResponse(open(file_path, 'rb'), content_type=content_type)
-            response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-            return response
+            # Passing the raw file object lets FileResponse hand it to the
+            # server's wsgi.file_wrapper (sendfile under gunicorn/uwsgi)
+            # instead of pumping bytes through Python.
+            return FileResponse(
+                open(file_path, 'rb'),
+                content_type=content_type,
+                as_attachment=True,
+                filename=os.path.basename(file_path),
+            )
 
         except Quote.DoesNotExist:
             raise Http404('Quote not found')